@@ -16,35 +16,108 @@ Version: 1.0
 import os
 import sys
 import json
-import yaml
+import re
+import shlex
+import shutil
 import subprocess
+import threading
 import argparse
+import collections
+import datetime
 import logging
-from typing import Dict, List, Optional, Any
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
-import getpass
 import ipaddress
 
-# Configure logging
+class _BatchedFileHandler(logging.FileHandler):
+    """FileHandler that leaves flushing its stream to the caller"""
+    
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+class _BatchedMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that flushes its target's stream once per drained batch"""
+    
+    def flush(self):
+        super().flush()
+        with self.lock:
+            if self.target is not None:
+                self.target.flush()
+
+# Configure logging; file writes are buffered and written in batches when
+# the buffer fills, on errors and by logging.shutdown() at exit
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+log_file_handler = _BatchedFileHandler('magma_deploy.log')
+log_file_handler.setFormatter(log_formatter)
+log_memory_handler = _BatchedMemoryHandler(
+    capacity=1024,
+    flushLevel=logging.ERROR,
+    target=log_file_handler
+)
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(log_formatter)
+
+# Records can be routed to a single handler with extra={"log_target": ...}
+log_memory_handler.addFilter(lambda record: getattr(record, "log_target", None) != "console")
+log_stream_handler.addFilter(lambda record: getattr(record, "log_target", None) != "file")
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('magma_deploy.log'),
-        logging.StreamHandler()
+        log_memory_handler,
+        log_stream_handler
     ]
 )
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _detect_os() -> Dict[str, str]:
+    """Parse /etc/os-release into a dict, once per process"""
+    info = {}
+    for line in Path("/etc/os-release").read_text().splitlines():
+        if "=" in line:
+            key, value = line.strip().split("=", 1)
+            info[key] = value.strip('"\'')
+    return info
+
+@lru_cache(maxsize=None)
+def _load_template(path: Path) -> str:
+    """Read a script template from disk once per process"""
+    return path.read_text(encoding='utf-8')
+
 class MagmaDeployment:
     """Main deployment class for Magma components"""
     
+    # Components listed in dependency order; each maps to the components
+    # that must finish deploying before it can start
+    COMPONENT_DEPENDENCIES = {
+        "orchestrator": [],
+        "agw": [],
+        "fgw": [],
+        "nms": ["orchestrator"],
+    }
+    
+    _EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+    _IPV4_RE = re.compile(r"(?:(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.){3}(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])")
+    
     def __init__(self):
         self.config = {}
         self.deployment_dir = Path(__file__).parent
         self.config_dir = self.deployment_dir / "config"
         self.scripts_dir = self.deployment_dir / "scripts"
         self.templates_dir = self.deployment_dir / "templates"
+        self.magma_dir = self.deployment_dir / "magma"
+        self._magma_repo_ready = False
+        self._magma_repo_lock = threading.Lock()
+        self._helm_repo_ready = False
         
         # Ensure directories exist
         self.config_dir.mkdir(exist_ok=True)
@@ -83,8 +156,26 @@ class MagmaDeployment:
             else:
                 print("Please enter 'y' for yes or 'n' for no.")
     
-    def get_user_input(self, prompt: str, default: str = None, required: bool = True) -> str:
-        """Get user input with optional default value"""
+    def _config_value(self, key: str) -> Any:
+        """Look up a dotted key such as ``agw.mcc`` in the loaded configuration"""
+        value = self.config
+        for part in key.split("."):
+            if not isinstance(value, dict) or value.get(part) is None:
+                return None
+            value = value[part]
+        return value
+    
+    def get_user_input(self, prompt: str, default: str = None, required: bool = True, *, key: Optional[str]) -> str:
+        """Get user input with optional default value
+        
+        If ``key`` is already set in the configuration (e.g. from ``--config``)
+        its value is used and no prompt is shown. Pass ``key=None`` to always
+        prompt, such as when re-asking after a failed validation.
+        """
+        value = self._config_value(key) if key else None
+        if value is not None and (value != "" or not required):
+            return str(value)
+        
         if default:
             full_prompt = f"{prompt} [{default}]: "
         else:
@@ -101,12 +192,22 @@ class MagmaDeployment:
             else:
                 print("This field is required. Please enter a value.")
     
-    def get_password(self, prompt: str) -> str:
-        """Get password input securely"""
+    def get_password(self, prompt: str, *, key: Optional[str]) -> str:
+        """Get password input securely, unless ``key`` is already configured"""
+        value = self._config_value(key) if key else None
+        if value:
+            return str(value)
+        
+        import getpass
+        
         return getpass.getpass(f"{prompt}: ")
     
     def validate_ip_address(self, ip: str) -> bool:
         """Validate IP address format"""
+        # Cheap check for the common dotted-quad case; anything else (IPv6)
+        # goes through ipaddress
+        if self._IPV4_RE.fullmatch(ip):
+            return True
         try:
             ipaddress.ip_address(ip)
             return True
@@ -115,11 +216,33 @@ class MagmaDeployment:
     
     def validate_email(self, email: str) -> bool:
         """Basic email validation"""
-        return "@" in email and "." in email.split("@")[1]
+        return bool(self._EMAIL_RE.fullmatch(email))
+    
+    def _truncate_output(self, output: str, max_log_bytes: int = 4096) -> str:
+        """Shorten command output before it is written to the log"""
+        if len(output) <= max_log_bytes:
+            return output
+        return f"{output[:max_log_bytes]}... ({len(output)} characters total)"
     
-    def run_command(self, command: str, shell: bool = True, check: bool = True) -> subprocess.CompletedProcess:
-        """Execute shell command with logging"""
+    def run_command(self, command: str, shell: bool = True, check: bool = True, stream: bool = False,
+                    log_output: bool = True, max_log_bytes: int = 4096,
+                    label: Optional[str] = None) -> subprocess.CompletedProcess:
+        """Execute shell command with logging
+        
+        Long-running commands should pass ``stream=True`` so their output is
+        forwarded to the log line by line instead of being buffered in memory.
+        Output longer than ``max_log_bytes`` characters is truncated in the log
+        file (streamed output keeps going to the console, and its last lines are
+        still written to the file); chatty commands can pass ``log_output=False``
+        to skip logging it.
+        Streamed lines are prefixed with ``label`` (e.g. ``[AGW]``) so output
+        from commands running concurrently can be told apart.
+        """
         logger.info(f"Executing command: {command}")
+        if stream:
+            return self._stream_command(command, shell=shell, check=check, log_output=log_output,
+                                       max_log_bytes=max_log_bytes, label=label)
+        
         try:
             result = subprocess.run(
                 command,
@@ -128,14 +251,118 @@ class MagmaDeployment:
                 capture_output=True,
                 text=True
             )
-            if result.stdout:
-                logger.info(f"Command output: {result.stdout}")
+            if result.stdout and log_output:
+                logger.info(f"Command output: {self._truncate_output(result.stdout, max_log_bytes)}")
             return result
         except subprocess.CalledProcessError as e:
             logger.error(f"Command failed: {e}")
-            logger.error(f"Error output: {e.stderr}")
+            logger.error(f"Error output: {self._truncate_output(e.stderr or '', max_log_bytes)}")
             raise
     
+    def _stream_command(self, command: str, shell: bool, check: bool, log_output: bool,
+                        max_log_bytes: int, label: Optional[str]) -> subprocess.CompletedProcess:
+        """Execute command, logging its combined stdout/stderr as it is produced"""
+        prefix = f"[{label}] " if label else ""
+        logged = 0
+        tail = collections.deque(maxlen=50)
+        with subprocess.Popen(
+            command,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        ) as proc:
+            for line in proc.stdout:
+                if not log_output:
+                    continue
+                message = f"{prefix}{line.rstrip()}"
+                if logged < max_log_bytes:
+                    logger.info(message)
+                    logged += len(line)
+                else:
+                    # Keep console progress but stop growing the log file
+                    logger.info(message, extra={"log_target": "console"})
+                    tail.append(message)
+            returncode = proc.wait()
+        
+        if tail:
+            logger.info(f"{prefix}... output truncated in the log file after {max_log_bytes} characters; "
+                        f"last {len(tail)} lines:", extra={"log_target": "file"})
+            for message in tail:
+                logger.info(message, extra={"log_target": "file"})
+        
+        if check and returncode != 0:
+            error = subprocess.CalledProcessError(returncode, command)
+            logger.error(f"{prefix}Command failed: {error}")
+            raise error
+        return subprocess.CompletedProcess(command, returncode)
+    
+    def _spawn_options(self, argv: List[str]) -> Dict[str, Any]:
+        """Popen options that let CPython start ``argv`` with posix_spawn
+        
+        CPython only takes its posix_spawn fast path when the executable is given
+        as a path and ``close_fds`` is off; descriptors Python opens are
+        non-inheritable, so nothing extra leaks into the child.
+        """
+        return {"executable": shutil.which(argv[0]) or argv[0], "close_fds": False}
+    
+    def run_argv(self, argv: List[str], input: str = None, check: bool = True,
+                 log_output: bool = True, max_log_bytes: int = 4096) -> subprocess.CompletedProcess:
+        """Execute a command from an argv list without an intermediate shell"""
+        logger.info(f"Executing command: {' '.join(argv)}")
+        try:
+            result = subprocess.run(
+                argv,
+                input=input,
+                check=check,
+                capture_output=True,
+                text=True,
+                **self._spawn_options(argv)
+            )
+            if result.stdout and log_output:
+                logger.info(f"Command output: {self._truncate_output(result.stdout, max_log_bytes)}")
+            return result
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Command failed: {e}")
+            logger.error(f"Error output: {self._truncate_output(e.stderr or '', max_log_bytes)}")
+            raise
+    
+    def run_pipeline(self, producer: List[str], consumer: List[str]) -> subprocess.CompletedProcess:
+        """Execute `producer | consumer` from argv lists without an intermediate shell"""
+        logger.info(f"Executing command: {' '.join(producer)} | {' '.join(consumer)}")
+        with subprocess.Popen(producer, stdout=subprocess.PIPE, **self._spawn_options(producer)) as upstream:
+            try:
+                result = subprocess.run(
+                    consumer,
+                    stdin=upstream.stdout,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    **self._spawn_options(consumer)
+                )
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Command failed: {e}")
+                logger.error(f"Error output: {self._truncate_output(e.stderr or '')}")
+                raise
+            finally:
+                upstream.stdout.close()
+        if upstream.returncode != 0:
+            logger.error(f"Command failed: {' '.join(producer)} exited with {upstream.returncode}")
+            raise subprocess.CalledProcessError(upstream.returncode, producer)
+        if result.stdout:
+            logger.info(f"Command output: {self._truncate_output(result.stdout)}")
+        return result
+    
+    def run_chain(self, steps: List[Union[str, List[str]]], **kwargs) -> subprocess.CompletedProcess:
+        """Execute several commands in a single shell, stopping at the first failure
+        
+        Steps given as argv lists are quoted with shlex; plain strings are passed
+        to the shell verbatim so they can use pipes and command substitution.
+        """
+        script = " && ".join(step if isinstance(step, str) else shlex.join(step) for step in steps)
+        return self.run_argv(["bash", "-c", f"set -eo pipefail; {script}"], **kwargs)
+    
     def check_prerequisites(self) -> bool:
         """Check if prerequisites are installed"""
         print("\n🔍 Checking prerequisites...")
@@ -151,15 +378,11 @@ class MagmaDeployment:
         missing_deps = []
         
         for cmd, description in prerequisites:
-            try:
-                result = self.run_command(f"which {cmd}", check=False)
-                if result.returncode == 0:
-                    print(f"✅ {cmd} found")
-                else:
-                    print(f"❌ {cmd} not found - {description}")
-                    missing_deps.append(cmd)
-            except Exception as e:
-                print(f"❌ Error checking {cmd}: {e}")
+            path = shutil.which(cmd)
+            if path:
+                print(f"✅ {cmd} found at {path}")
+            else:
+                print(f"❌ {cmd} not found - {description}")
                 missing_deps.append(cmd)
         
         if missing_deps:
@@ -179,91 +402,118 @@ class MagmaDeployment:
         
         # Detect OS
         try:
-            os_release = self.run_command("cat /etc/os-release").stdout
-            if "ubuntu" in os_release.lower() or "debian" in os_release.lower():
-                package_manager = "apt"
-            elif "centos" in os_release.lower() or "rhel" in os_release.lower():
-                package_manager = "yum"
-            else:
-                print("Unsupported OS. Please install prerequisites manually.")
-                return False
-        except:
+            os_info = _detect_os()
+        except OSError:
             print("Could not detect OS. Please install prerequisites manually.")
             return False
         
-        # Install packages
-        for dep in missing_deps:
+        os_ids = {os_info.get("ID", ""), *os_info.get("ID_LIKE", "").split()}
+        if {"ubuntu", "debian"} & os_ids:
+            package_manager = "apt"
+        elif {"centos", "rhel"} & os_ids:
+            package_manager = "yum"
+        else:
+            print("Unsupported OS. Please install prerequisites manually.")
+            return False
+        
+        installers = {
+            "docker": lambda: self.install_docker(package_manager),
+            "docker-compose": self.install_docker_compose,
+            "kubectl": self.install_kubectl,
+            "helm": self.install_helm,
+            "git": lambda: self.install_git(package_manager),
+        }
+        
+        # Package manager installs hold the apt/yum lock, so run them one at a
+        # time; the remaining installers are independent downloads
+        serial = [dep for dep in missing_deps if dep in ("docker", "git")]
+        parallel = [dep for dep in missing_deps if dep not in serial]
+        
+        def install(dep: str) -> bool:
             try:
-                if dep == "docker":
-                    self.install_docker(package_manager)
-                elif dep == "docker-compose":
-                    self.install_docker_compose()
-                elif dep == "kubectl":
-                    self.install_kubectl()
-                elif dep == "helm":
-                    self.install_helm()
-                elif dep == "git":
-                    if package_manager == "apt":
-                        self.run_command("sudo apt-get update && sudo apt-get install -y git")
-                    else:
-                        self.run_command("sudo yum install -y git")
+                installers[dep]()
+                return True
             except Exception as e:
                 logger.error(f"Failed to install {dep}: {e}")
                 return False
         
-        return True
+        if not all(install(dep) for dep in serial):
+            return False
+        
+        # The parallel installers all use sudo; authenticate once up front so
+        # they don't race for the terminal with separate password prompts
+        if parallel:
+            try:
+                subprocess.run(["sudo", "-v"], check=True)
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.error(f"Failed to obtain sudo credentials: {e}")
+                return False
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(install, parallel))
+        
+        return all(results)
+    
+    def install_git(self, package_manager: str):
+        """Install Git"""
+        if package_manager == "apt":
+            self.run_chain([
+                ["sudo", "apt-get", "update"],
+                ["sudo", "apt-get", "install", "-y", "git"]
+            ])
+        else:
+            self.run_argv(["sudo", "yum", "install", "-y", "git"])
     
     def install_docker(self, package_manager: str):
         """Install Docker"""
         if package_manager == "apt":
-            commands = [
-                "sudo apt-get update",
-                "sudo apt-get install -y apt-transport-https ca-certificates curl gnupg lsb-release",
-                "curl -fsSL https://download.docker.com/linux/ubuntu/gpg | sudo gpg --dearmor -o /usr/share/keyrings/docker-archive-keyring.gpg",
-                "echo \"deb [arch=amd64 signed-by=/usr/share/keyrings/docker-archive-keyring.gpg] https://download.docker.com/linux/ubuntu $(lsb_release -cs) stable\" | sudo tee /etc/apt/sources.list.d/docker.list > /dev/null",
-                "sudo apt-get update",
-                "sudo apt-get install -y docker-ce docker-ce-cli containerd.io"
+            keyring = "/usr/share/keyrings/docker-archive-keyring.gpg"
+            steps = [
+                ["sudo", "apt-get", "update"],
+                ["sudo", "apt-get", "install", "-y", "apt-transport-https", "ca-certificates", "curl", "gnupg", "lsb-release"],
+                f"curl -fsSL https://download.docker.com/linux/ubuntu/gpg | sudo gpg --dearmor -o {keyring}",
+                f"echo \"deb [arch=amd64 signed-by={keyring}] https://download.docker.com/linux/ubuntu $(lsb_release -cs) stable\" | sudo tee /etc/apt/sources.list.d/docker.list > /dev/null",
+                ["sudo", "apt-get", "update"],
+                ["sudo", "apt-get", "install", "-y", "docker-ce", "docker-ce-cli", "containerd.io"]
             ]
         else:
-            commands = [
-                "sudo yum install -y yum-utils",
-                "sudo yum-config-manager --add-repo https://download.docker.com/linux/centos/docker-ce.repo",
-                "sudo yum install -y docker-ce docker-ce-cli containerd.io"
+            steps = [
+                ["sudo", "yum", "install", "-y", "yum-utils"],
+                ["sudo", "yum-config-manager", "--add-repo", "https://download.docker.com/linux/centos/docker-ce.repo"],
+                ["sudo", "yum", "install", "-y", "docker-ce", "docker-ce-cli", "containerd.io"]
             ]
         
-        for cmd in commands:
-            self.run_command(cmd)
-        
-        # Start Docker service
-        self.run_command("sudo systemctl start docker")
-        self.run_command("sudo systemctl enable docker")
-        
-        # Add user to docker group
-        username = self.run_command("whoami").stdout.strip()
-        self.run_command(f"sudo usermod -aG docker {username}")
+        # Start Docker service and add user to docker group
+        steps += [
+            ["sudo", "systemctl", "start", "docker"],
+            ["sudo", "systemctl", "enable", "docker"],
+            "sudo usermod -aG docker \"$(whoami)\""
+        ]
+        self.run_chain(steps, log_output=False)
         print("⚠️  Please log out and log back in to use Docker without sudo")
     
     def install_docker_compose(self):
         """Install Docker Compose"""
-        self.run_command("sudo curl -L \"https://github.com/docker/compose/releases/download/1.29.2/docker-compose-$(uname -s)-$(uname -m)\" -o /usr/local/bin/docker-compose")
-        self.run_command("sudo chmod +x /usr/local/bin/docker-compose")
+        uname = os.uname()
+        url = f"https://github.com/docker/compose/releases/download/1.29.2/docker-compose-{uname.sysname}-{uname.machine}"
+        self.run_chain([
+            ["sudo", "curl", "-L", url, "-o", "/usr/local/bin/docker-compose"],
+            ["sudo", "chmod", "+x", "/usr/local/bin/docker-compose"]
+        ])
     
     def install_kubectl(self):
         """Install kubectl"""
-        commands = [
+        self.run_chain([
             "curl -LO \"https://dl.k8s.io/release/$(curl -L -s https://dl.k8s.io/release/stable.txt)/bin/linux/amd64/kubectl\"",
-            "sudo install -o root -g root -m 0755 kubectl /usr/local/bin/kubectl"
-        ]
-        for cmd in commands:
-            self.run_command(cmd)
+            ["sudo", "install", "-o", "root", "-g", "root", "-m", "0755", "kubectl", "/usr/local/bin/kubectl"]
+        ])
     
     def install_helm(self):
         """Install Helm"""
-        commands = [
-            "curl https://raw.githubusercontent.com/helm/helm/main/scripts/get-helm-3 | bash"
-        ]
-        for cmd in commands:
-            self.run_command(cmd)
+        self.run_pipeline(
+            ["curl", "https://raw.githubusercontent.com/helm/helm/main/scripts/get-helm-3"],
+            ["bash"]
+        )
     
     def collect_deployment_config(self):
         """Collect deployment configuration from user"""
@@ -271,44 +521,54 @@ class MagmaDeployment:
         print("=" * 40)
         
         # Deployment type selection
-        print("\nSelect components to deploy:")
-        print("1. Full Magma Stack (Orchestrator + AGW + FGW + NMS)")
-        print("2. Orchestrator only")
-        print("3. Access Gateway only")
-        print("4. Federated Gateway only")
-        print("5. Custom selection")
-        
-        choice = self.get_user_input("Enter your choice (1-5)", "1")
-        
-        if choice == "1":
-            self.config["components"] = ["orchestrator", "agw", "fgw", "nms"]
-        elif choice == "2":
-            self.config["components"] = ["orchestrator"]
-        elif choice == "3":
-            self.config["components"] = ["agw"]
-        elif choice == "4":
-            self.config["components"] = ["fgw"]
-        elif choice == "5":
-            self.config["components"] = []
-            components = ["orchestrator", "agw", "fgw", "nms"]
-            for comp in components:
-                if self.confirm_action(f"Deploy {comp.upper()}?"):
-                    self.config["components"].append(comp)
+        if self.config.get("components"):
+            components = self.config["components"]
+            if not isinstance(components, list):
+                raise ValueError(f"components must be a list in the configuration file, got {components!r}")
+            unknown = [comp for comp in components if comp not in self.COMPONENT_DEPENDENCIES]
+            if unknown:
+                raise ValueError(f"Unknown components in configuration: {', '.join(map(str, unknown))}")
+            print(f"\nComponents from configuration: {', '.join(self.config['components'])}")
+        else:
+            print("\nSelect components to deploy:")
+            print("1. Full Magma Stack (Orchestrator + AGW + FGW + NMS)")
+            print("2. Orchestrator only")
+            print("3. Access Gateway only")
+            print("4. Federated Gateway only")
+            print("5. Custom selection")
+            
+            choice = self.get_user_input("Enter your choice (1-5)", "1", key=None)
+            
+            if choice == "1":
+                self.config["components"] = ["orchestrator", "agw", "fgw", "nms"]
+            elif choice == "2":
+                self.config["components"] = ["orchestrator"]
+            elif choice == "3":
+                self.config["components"] = ["agw"]
+            elif choice == "4":
+                self.config["components"] = ["fgw"]
+            elif choice == "5":
+                self.config["components"] = []
+                components = ["orchestrator", "agw", "fgw", "nms"]
+                for comp in components:
+                    if self.confirm_action(f"Deploy {comp.upper()}?"):
+                        self.config["components"].append(comp)
         
         # General configuration
-        self.config["domain"] = self.get_user_input("Domain name", "magma.local")
-        self.config["admin_email"] = self.get_user_input("Admin email address")
+        self.config["domain"] = self.get_user_input("Domain name", "magma.local", key="domain")
+        self.config["admin_email"] = self.get_user_input("Admin email address", key="admin_email")
         while not self.validate_email(self.config["admin_email"]):
             print("Invalid email format.")
-            self.config["admin_email"] = self.get_user_input("Admin email address")
+            self.config["admin_email"] = self.get_user_input("Admin email address", key=None)
         
         # Network configuration
         print("\n🌐 Network Configuration")
-        self.config["network"] = {}
-        self.config["network"]["external_ip"] = self.get_user_input("External IP address")
+        if not isinstance(self.config.get("network"), dict):
+            self.config["network"] = {}
+        self.config["network"]["external_ip"] = self.get_user_input("External IP address", key="network.external_ip")
         while not self.validate_ip_address(self.config["network"]["external_ip"]):
             print("Invalid IP address format.")
-            self.config["network"]["external_ip"] = self.get_user_input("External IP address")
+            self.config["network"]["external_ip"] = self.get_user_input("External IP address", key=None)
         
         # Component-specific configuration
         if "orchestrator" in self.config["components"]:
@@ -320,90 +580,180 @@ class MagmaDeployment:
         if "fgw" in self.config["components"]:
             self.collect_fgw_config()
         
-        # Save configuration
+        # Save configuration, preferring the libyaml-backed C emitter
+        import yaml
+        try:
+            from yaml import CSafeDumper as SafeDumper
+        except ImportError:
+            from yaml import SafeDumper
+        
         config_file = self.config_dir / "deployment_config.yaml"
         with open(config_file, 'w') as f:
-            yaml.dump(self.config, f, default_flow_style=False)
+            yaml.dump(self.config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
         
         print(f"\n✅ Configuration saved to {config_file}")
     
     def collect_orchestrator_config(self):
         """Collect orchestrator-specific configuration"""
         print("\n🏗️  Orchestrator Configuration")
-        self.config["orchestrator"] = {}
+        if not isinstance(self.config.get("orchestrator"), dict):
+            self.config["orchestrator"] = {}
         
         # Kubernetes configuration
-        self.config["orchestrator"]["namespace"] = self.get_user_input("Kubernetes namespace", "magma")
-        self.config["orchestrator"]["storage_class"] = self.get_user_input("Storage class", "standard")
+        self.config["orchestrator"]["namespace"] = self.get_user_input("Kubernetes namespace", "magma", key="orchestrator.namespace")
+        self.config["orchestrator"]["storage_class"] = self.get_user_input("Storage class", "standard", key="orchestrator.storage_class")
         
         # Database configuration
-        self.config["orchestrator"]["db_host"] = self.get_user_input("Database host", "postgresql")
-        self.config["orchestrator"]["db_port"] = self.get_user_input("Database port", "5432")
-        self.config["orchestrator"]["db_user"] = self.get_user_input("Database user", "magma")
-        self.config["orchestrator"]["db_password"] = self.get_password("Database password")
-        self.config["orchestrator"]["db_name"] = self.get_user_input("Database name", "magma")
+        self.config["orchestrator"]["db_host"] = self.get_user_input("Database host", "postgresql", key="orchestrator.db_host")
+        self.config["orchestrator"]["db_port"] = self.get_user_input("Database port", "5432", key="orchestrator.db_port")
+        self.config["orchestrator"]["db_user"] = self.get_user_input("Database user", "magma", key="orchestrator.db_user")
+        self.config["orchestrator"]["db_password"] = self.get_password("Database password", key="orchestrator.db_password")
+        self.config["orchestrator"]["db_name"] = self.get_user_input("Database name", "magma", key="orchestrator.db_name")
         
         # TLS configuration
-        self.config["orchestrator"]["tls_cert_path"] = self.get_user_input("TLS certificate path", "/opt/magma/certs/tls.crt", required=False)
-        self.config["orchestrator"]["tls_key_path"] = self.get_user_input("TLS key path", "/opt/magma/certs/tls.key", required=False)
+        self.config["orchestrator"]["tls_cert_path"] = self.get_user_input("TLS certificate path", "/opt/magma/certs/tls.crt", required=False, key="orchestrator.tls_cert_path")
+        self.config["orchestrator"]["tls_key_path"] = self.get_user_input("TLS key path", "/opt/magma/certs/tls.key", required=False, key="orchestrator.tls_key_path")
     
     def collect_agw_config(self):
         """Collect AGW-specific configuration"""
         print("\n📡 Access Gateway Configuration")
-        self.config["agw"] = {}
+        if not isinstance(self.config.get("agw"), dict):
+            self.config["agw"] = {}
+        
+        # YAML reads an unquoted `mcc: 001` as the integer 1, dropping the
+        # leading zeros the mconfig needs
+        for code in ("mcc", "mnc"):
+            value = self.config["agw"].get(code)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"agw.{code} must be quoted in the configuration file (e.g. \"001\"), got {value!r}")
         
         # Network configuration
-        self.config["agw"]["interface"] = self.get_user_input("Network interface", "eth0")
-        self.config["agw"]["ip_address"] = self.get_user_input("AGW IP address")
+        self.config["agw"]["interface"] = self.get_user_input("Network interface", "eth0", key="agw.interface")
+        self.config["agw"]["ip_address"] = self.get_user_input("AGW IP address", key="agw.ip_address")
         while not self.validate_ip_address(self.config["agw"]["ip_address"]):
             print("Invalid IP address format.")
-            self.config["agw"]["ip_address"] = self.get_user_input("AGW IP address")
+            self.config["agw"]["ip_address"] = self.get_user_input("AGW IP address", key=None)
         
         # LTE configuration
-        self.config["agw"]["mcc"] = self.get_user_input("Mobile Country Code (MCC)", "001")
-        self.config["agw"]["mnc"] = self.get_user_input("Mobile Network Code (MNC)", "01")
-        self.config["agw"]["tac"] = self.get_user_input("Tracking Area Code (TAC)", "1")
+        self.config["agw"]["mcc"] = self.get_user_input("Mobile Country Code (MCC)", "001", key="agw.mcc")
+        self.config["agw"]["mnc"] = self.get_user_input("Mobile Network Code (MNC)", "01", key="agw.mnc")
+        self.config["agw"]["tac"] = self.get_user_input("Tracking Area Code (TAC)", "1", key="agw.tac")
         
         # S1AP configuration
-        self.config["agw"]["s1ap_ip"] = self.get_user_input("S1AP IP address", self.config["agw"]["ip_address"])
-        self.config["agw"]["s1ap_port"] = self.get_user_input("S1AP port", "36412")
+        self.config["agw"]["s1ap_ip"] = self.get_user_input("S1AP IP address", self.config["agw"]["ip_address"], key="agw.s1ap_ip")
+        self.config["agw"]["s1ap_port"] = self.get_user_input("S1AP port", "36412", key="agw.s1ap_port")
     
     def collect_fgw_config(self):
         """Collect FGW-specific configuration"""
         print("\n🔗 Federated Gateway Configuration")
-        self.config["fgw"] = {}
+        if not isinstance(self.config.get("fgw"), dict):
+            self.config["fgw"] = {}
         
         # Federation configuration
-        self.config["fgw"]["federation_id"] = self.get_user_input("Federation ID", "fgw01")
-        self.config["fgw"]["served_network_ids"] = self.get_user_input("Served network IDs (comma-separated)", "network1,network2").split(",")
+        self.config["fgw"]["federation_id"] = self.get_user_input("Federation ID", "fgw01", key="fgw.federation_id")
+        if not isinstance(self.config["fgw"].get("served_network_ids"), list):
+            self.config["fgw"]["served_network_ids"] = self.get_user_input("Served network IDs (comma-separated)", "network1,network2", key="fgw.served_network_ids").split(",")
         
         # Diameter configuration
-        self.config["fgw"]["diameter_host"] = self.get_user_input("Diameter host", "fgw.magma.local")
-        self.config["fgw"]["diameter_realm"] = self.get_user_input("Diameter realm", "magma.local")
-        self.config["fgw"]["diameter_port"] = self.get_user_input("Diameter port", "3868")
+        self.config["fgw"]["diameter_host"] = self.get_user_input("Diameter host", "fgw.magma.local", key="fgw.diameter_host")
+        self.config["fgw"]["diameter_realm"] = self.get_user_input("Diameter realm", "magma.local", key="fgw.diameter_realm")
+        self.config["fgw"]["diameter_port"] = self.get_user_input("Diameter port", "3868", key="fgw.diameter_port")
     
     def deploy_components(self):
-        """Deploy selected components"""
+        """Deploy selected components, running independent ones concurrently"""
         print("\n🚀 STARTING DEPLOYMENT")
         print("=" * 40)
         
-        for component in self.config["components"]:
-            print(f"\n📦 Deploying {component.upper()}...")
-            
-            if component == "orchestrator":
-                self.deploy_orchestrator()
-            elif component == "agw":
-                self.deploy_agw()
-            elif component == "fgw":
-                self.deploy_fgw()
-            elif component == "nms":
-                self.deploy_nms()
+        deployers = {
+            "orchestrator": self.deploy_orchestrator,
+            "agw": self.deploy_agw,
+            "fgw": self.deploy_fgw,
+            "nms": self.deploy_nms,
+        }
+        
+        # Orchestrator and NMS both install charts from the Magma Helm repository
+        if {"orchestrator", "nms"} & set(self.config["components"]):
+            self._ensure_helm_repo()
+        
+        futures = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for component, dependencies in self.COMPONENT_DEPENDENCIES.items():
+                if component not in self.config["components"]:
+                    continue
+                
+                upstream = {dep: futures[dep] for dep in dependencies if dep in futures}
+                futures[component] = executor.submit(
+                    self.deploy_component, component, deployers[component], upstream
+                )
             
-            print(f"✅ {component.upper()} deployment completed")
+            components = {future: name for name, future in futures.items()}
+            for future in as_completed(components):
+                component = components[future]
+                try:
+                    future.result()
+                    print(f"✅ {component.upper()} deployment completed")
+                except Exception as e:
+                    logger.error(f"{component.upper()} deployment failed: {e}")
+                    print(f"❌ {component.upper()} deployment failed: {e}")
+                    failed.append(component)
+        
+        if failed:
+            raise RuntimeError(f"Deployment failed for: {', '.join(failed)}")
         
         print("\n🎉 All selected components deployed successfully!")
         self.display_deployment_summary()
     
+    def _ensure_magma_repo(self):
+        """Clone the Magma repository, or fast-forward an existing checkout, once per run
+        
+        AGW and FGW build from the same checkout and deploy concurrently, so the
+        first of them to get here prepares it while the other waits on the lock.
+        """
+        with self._magma_repo_lock:
+            if self._magma_repo_ready:
+                return
+            
+            if not self.magma_dir.exists():
+                print("Cloning Magma repository...")
+                self.run_command(
+                    shlex.join(["git", "clone", "--progress", "https://github.com/magma/magma.git", str(self.magma_dir)]),
+                    stream=True, label="GIT"
+                )
+            else:
+                print("Updating Magma repository...")
+                try:
+                    self.run_command(
+                        shlex.join(["git", "-C", str(self.magma_dir), "pull", "--ff-only", "--progress"]),
+                        stream=True, label="GIT"
+                    )
+                except subprocess.CalledProcessError:
+                    print("⚠️  Could not fast-forward the Magma checkout, using it as is")
+            
+            self._magma_repo_ready = True
+    
+    def _ensure_helm_repo(self):
+        """Add the Magma Helm repository and refresh its index, once per run"""
+        if self._helm_repo_ready:
+            return
+        
+        print("Updating Magma Helm repository...")
+        # --force-update makes the add idempotent when the repository already exists
+        self.run_chain([
+            ["helm", "repo", "add", "--force-update", "magma", "https://magma.github.io/magma/helm-charts"],
+            ["helm", "repo", "update", "magma"]
+        ])
+        self._helm_repo_ready = True
+    
+    def deploy_component(self, component: str, deployer, upstream: Dict[str, Any]):
+        """Deploy a single component once the components it depends on are up"""
+        for dependency, future in upstream.items():
+            if future.exception() is not None:
+                raise RuntimeError(f"skipped because {dependency.upper()} failed")
+        
+        print(f"\n📦 Deploying {component.upper()}...")
+        deployer()
+    
     def deploy_orchestrator(self):
         """Deploy the orchestrator component"""
         print("Setting up Orchestrator...")
@@ -414,37 +764,113 @@ class MagmaDeployment:
         except subprocess.CalledProcessError:
             print("Namespace already exists or error creating it")
         
+        # Create TLS certificates if not provided
+        self._ensure_tls()
+        
         # Generate orchestrator deployment script
         orc8r_script = self.scripts_dir / "deploy_orchestrator.sh"
         self.generate_orchestrator_script(orc8r_script)
         
         # Execute deployment
-        self.run_command(f"chmod +x {orc8r_script}")
-        self.run_command(str(orc8r_script))
+        orc8r_script.chmod(0o755)
+        self.run_command(str(orc8r_script), stream=True, label="ORCHESTRATOR")
+    
+    def _tls_paths(self) -> Tuple[Path, Path]:
+        """Return the configured TLS certificate and key paths"""
+        orc = self.config['orchestrator']
+        return (
+            Path(orc.get('tls_cert_path') or '/opt/magma/certs/tls.crt'),
+            Path(orc.get('tls_key_path') or '/opt/magma/certs/tls.key'),
+        )
+    
+    def _ensure_tls(self):
+        """Generate a self-signed TLS certificate for the orchestrator unless both it and its key exist"""
+        cert_path, key_path = self._tls_paths()
+        if cert_path.exists() and key_path.exists():
+            return
+        
+        print("Generating TLS certificates...")
+        cert_path.parent.mkdir(parents=True, exist_ok=True)
+        key_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Make the key file owner-only before any key material is written to it;
+        # O_CREAT's mode is ignored for an existing file, so fchmod explicitly.
+        # Later truncating writes (ours or openssl's) keep this mode.
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.fchmod(fd, 0o600)
+        finally:
+            os.close(fd)
+        
+        try:
+            from cryptography import x509
+            from cryptography.hazmat.primitives import hashes, serialization
+            from cryptography.hazmat.primitives.asymmetric import rsa
+            from cryptography.x509.oid import NameOID
+        except ImportError:
+            # Fall back to the openssl CLI when cryptography is not installed
+            self.run_argv([
+                "openssl", "req", "-x509", "-newkey", "rsa:4096",
+                "-keyout", str(key_path), "-out", str(cert_path),
+                "-days", "365", "-nodes", "-subj", f"/CN={self.config['domain']}",
+                "-addext", f"subjectAltName=DNS:{self.config['domain']}",
+                "-addext", "basicConstraints=critical,CA:TRUE"
+            ])
+            return
+        
+        # Same extensions openssl req -x509 produces above; clients such as Go's
+        # crypto/tls reject certificates without a subjectAltName
+        key = rsa.generate_private_key(public_exponent=65537, key_size=4096)
+        public_key = key.public_key()
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, self.config['domain'])])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(public_key)
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(now + datetime.timedelta(days=365))
+            .add_extension(x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False)
+            .add_extension(x509.AuthorityKeyIdentifier.from_issuer_public_key(public_key), critical=False)
+            .add_extension(x509.SubjectAlternativeName([x509.DNSName(self.config['domain'])]), critical=False)
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+            .sign(key, hashes.SHA256())
+        )
+        
+        key_path.write_bytes(key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        ))
+        cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
     
     def deploy_agw(self):
         """Deploy the Access Gateway component"""
         print("Setting up Access Gateway...")
+        self._ensure_magma_repo()
         
         # Generate AGW deployment script
         agw_script = self.scripts_dir / "deploy_agw.sh"
         self.generate_agw_script(agw_script)
         
         # Execute deployment
-        self.run_command(f"chmod +x {agw_script}")
-        self.run_command(str(agw_script))
+        agw_script.chmod(0o755)
+        self.run_command(str(agw_script), stream=True, label="AGW")
     
     def deploy_fgw(self):
         """Deploy the Federated Gateway component"""
         print("Setting up Federated Gateway...")
+        self._ensure_magma_repo()
         
         # Generate FGW deployment script
         fgw_script = self.scripts_dir / "deploy_fgw.sh"
         self.generate_fgw_script(fgw_script)
         
         # Execute deployment
-        self.run_command(f"chmod +x {fgw_script}")
-        self.run_command(str(fgw_script))
+        fgw_script.chmod(0o755)
+        self.run_command(str(fgw_script), stream=True, label="FGW")
     
     def deploy_nms(self):
         """Deploy the Network Management System"""
@@ -455,151 +881,97 @@ class MagmaDeployment:
         self.generate_nms_script(nms_script)
         
         # Execute deployment
-        self.run_command(f"chmod +x {nms_script}")
-        self.run_command(str(nms_script))
+        nms_script.chmod(0o755)
+        self.run_command(str(nms_script), stream=True, label="NMS")
     
     def generate_orchestrator_script(self, script_path: Path):
         """Generate orchestrator deployment script"""
+        orc = self.config['orchestrator']
+        domain = self.config['domain']
+        tls_cert, tls_key = self._tls_paths()
+        
         script_content = f"""#!/bin/bash
 set -e
 
 echo "🏗️  Deploying Magma Orchestrator..."
 
-# Add Magma Helm repository
-helm repo add magma https://magma.github.io/magma/helm-charts
-helm repo update
+# Render PostgreSQL and Orchestrator manifests up front and apply them in one
+# pass so their pods are scheduled together. The rendered manifests are kept
+# (they contain credentials, so only the owner can read them) for cleanup.sh,
+# since these resources are not tracked as Helm releases. The namespace they
+# were applied to is recorded alongside; kubectl -f skips the extensionless file
+manifests_dir="{self.scripts_dir / 'orchestrator-manifests'}"
+mkdir -p "$manifests_dir"
+chmod 700 "$manifests_dir"
+umask 077
+echo "{orc['namespace']}" > "$manifests_dir/namespace"
 
-# Create TLS certificates if not provided
-if [[ ! -f "{self.config['orchestrator'].get('tls_cert_path', '/opt/magma/certs/tls.crt')}" ]]; then
-    echo "Generating TLS certificates..."
-    mkdir -p /opt/magma/certs
-    openssl req -x509 -newkey rsa:4096 -keyout /opt/magma/certs/tls.key -out /opt/magma/certs/tls.crt -days 365 -nodes -subj "/CN={self.config['domain']}"
-fi
+helm template postgresql oci://registry-1.docker.io/bitnamicharts/postgresql \\
+    --namespace {orc['namespace']} \\
+    --set auth.postgresPassword={orc['db_password']} \\
+    --set auth.database={orc['db_name']} \\
+    --set auth.username={orc['db_user']} \\
+    --set primary.persistence.storageClass={orc['storage_class']} \\
+    > "$manifests_dir/postgresql.yaml"
 
-# Deploy PostgreSQL
-helm upgrade --install postgresql oci://registry-1.docker.io/bitnamicharts/postgresql \\
-    --namespace {self.config['orchestrator']['namespace']} \\
-    --set auth.postgresPassword={self.config['orchestrator']['db_password']} \\
-    --set auth.database={self.config['orchestrator']['db_name']} \\
-    --set auth.username={self.config['orchestrator']['db_user']} \\
-    --set primary.persistence.storageClass={self.config['orchestrator']['storage_class']}
+helm template orc8r magma/orc8r \\
+    --namespace {orc['namespace']} \\
+    --set global.domain={domain} \\
+    --set postgresql.host={orc['db_host']} \\
+    --set postgresql.port={orc['db_port']} \\
+    --set postgresql.user={orc['db_user']} \\
+    --set postgresql.password={orc['db_password']} \\
+    --set postgresql.database={orc['db_name']} \\
+    --set-file tls.crt={tls_cert} \\
+    --set-file tls.key={tls_key} \\
+    > "$manifests_dir/orc8r.yaml"
 
-# Wait for PostgreSQL to be ready
-kubectl wait --for=condition=ready pod -l app.kubernetes.io/name=postgresql -n {self.config['orchestrator']['namespace']} --timeout=300s
+# --force-conflicts takes over fields owned by an earlier `helm upgrade --install`
+cat "$manifests_dir/postgresql.yaml" "$manifests_dir/orc8r.yaml" | \\
+    kubectl apply --server-side --force-conflicts --field-manager=magma-deploy \\
+    --namespace {orc['namespace']} -f -
 
-# Deploy Orchestrator
-helm upgrade --install orc8r magma/orc8r \\
-    --namespace {self.config['orchestrator']['namespace']} \\
-    --set global.domain={self.config['domain']} \\
-    --set postgresql.host={self.config['orchestrator']['db_host']} \\
-    --set postgresql.port={self.config['orchestrator']['db_port']} \\
-    --set postgresql.user={self.config['orchestrator']['db_user']} \\
-    --set postgresql.password={self.config['orchestrator']['db_password']} \\
-    --set postgresql.database={self.config['orchestrator']['db_name']} \\
-    --set-file tls.crt={self.config['orchestrator'].get('tls_cert_path', '/opt/magma/certs/tls.crt')} \\
-    --set-file tls.key={self.config['orchestrator'].get('tls_key_path', '/opt/magma/certs/tls.key')}
+# Wait for PostgreSQL, then the Orchestrator workloads, to finish rolling out
+for manifest in "$manifests_dir/postgresql.yaml" "$manifests_dir/orc8r.yaml"; do
+    kubectl get -f "$manifest" --namespace {orc['namespace']} -o name | \\
+        grep -E '^(deployment|statefulset|daemonset)\\.apps/' | \\
+        xargs -r -n1 kubectl rollout status --namespace {orc['namespace']} --timeout=600s
+done
 
 echo "✅ Orchestrator deployment completed"
 """
         
-        with open(script_path, 'w') as f:
-            f.write(script_content)
+        script_path.write_text(script_content, encoding='utf-8')
     
     def generate_agw_script(self, script_path: Path):
         """Generate AGW deployment script"""
-        script_content = f"""#!/bin/bash
-set -e
-
-echo "📡 Deploying Access Gateway..."
-
-# Clone Magma repository
-if [[ ! -d "magma" ]]; then
-    git clone https://github.com/magma/magma.git
-fi
-
-cd magma
-
-# Build AGW
-cd lte/gateway
-make build
-
-# Configure AGW
-mkdir -p /etc/magma
-cat > /etc/magma/gateway.mconfig << EOF
----
-magmad_config:
-  checkin_interval: 60
-  checkin_timeout: 30
-  autoupgrade_enabled: false
-  autoupgrade_poll_interval: 300
-  package_version: "0.0.0-0"
-  images: []
-  tier: "default"
-  feature_flags: {{}}
-  dynamic_services: []
-
-mconfig:
-  mobility_config:
-    ip_pool: "192.168.128.0/24"
-    static_ip_enabled: false
-    multi_apn_ip_alloc: false
-    nat_enabled: true
-    enable_static_ip_assignments: false
-    
-  mme_config:
-    mcc: "{self.config['agw']['mcc']}"
-    mnc: "{self.config['agw']['mnc']}"
-    tac: {self.config['agw']['tac']}
-    mme_code: 1
-    mme_gid: 1
-    enable_dns_caching: false
-    non_eps_service_control: 0
-    csfb_mcc: "{self.config['agw']['mcc']}"
-    csfb_mnc: "{self.config['agw']['mnc']}"
-    lac: 1
-    s1ap_ip: "{self.config['agw']['s1ap_ip']}"
-    s1ap_port: {self.config['agw']['s1ap_port']}
-    
-  spgw_config:
-    enable_nat: true
-    gtpu_endpoint: "{self.config['agw']['ip_address']}"
-    
-  enodebd_config:
-    earfcndl: 44490
-    subframe_assignment: 2
-    special_subframe_pattern: 7
-    pci: 260
-    plmn_ids:
-      - mcc: "{self.config['agw']['mcc']}"
-        mnc: "{self.config['agw']['mnc']}"
-EOF
-
-# Start AGW services
-sudo systemctl enable magma@*
-sudo systemctl start magma@*
-
-echo "✅ Access Gateway deployment completed"
-"""
+        agw = self.config['agw']
+        mcc, mnc, tac = agw['mcc'], agw['mnc'], agw['tac']
+        s1ap_ip, s1ap_port, ip_address = agw['s1ap_ip'], agw['s1ap_port'], agw['ip_address']
         
-        with open(script_path, 'w') as f:
-            f.write(script_content)
+        script_content = _load_template(self.templates_dir / "agw.sh.tmpl").format_map({
+            "magma_dir": self.magma_dir,
+            "mcc": mcc,
+            "mnc": mnc,
+            "tac": tac,
+            "s1ap_ip": s1ap_ip,
+            "s1ap_port": s1ap_port,
+            "ip_address": ip_address,
+        })
+        
+        script_path.write_text(script_content, encoding='utf-8')
     
     def generate_fgw_script(self, script_path: Path):
         """Generate FGW deployment script"""
+        fgw = self.config['fgw']
+        
         script_content = f"""#!/bin/bash
 set -e
 
 echo "🔗 Deploying Federated Gateway..."
 
-# Clone Magma repository
-if [[ ! -d "magma" ]]; then
-    git clone https://github.com/magma/magma.git
-fi
-
-cd magma
-
 # Build FGW
-cd feg/gateway
+cd "{self.magma_dir}/feg/gateway"
 make build
 
 # Configure FGW
@@ -619,13 +991,13 @@ magmad_config:
 
 mconfig:
   federation_config:
-    federation_id: "{self.config['fgw']['federation_id']}"
-    served_network_ids: {self.config['fgw']['served_network_ids']}
+    federation_id: "{fgw['federation_id']}"
+    served_network_ids: {fgw['served_network_ids']}
     
   diameter_config:
-    host: "{self.config['fgw']['diameter_host']}"
-    realm: "{self.config['fgw']['diameter_realm']}"
-    port: {self.config['fgw']['diameter_port']}
+    host: "{fgw['diameter_host']}"
+    realm: "{fgw['diameter_realm']}"
+    port: {fgw['diameter_port']}
     
   health_config:
     health_service_enabled: true
@@ -639,39 +1011,36 @@ mconfig:
 EOF
 
 # Start FGW services
-sudo systemctl enable magma@*
-sudo systemctl start magma@*
+sudo systemctl enable --now magma@magmad.service
 
 echo "✅ Federated Gateway deployment completed"
 """
         
-        with open(script_path, 'w') as f:
-            f.write(script_content)
+        script_path.write_text(script_content, encoding='utf-8')
     
     def generate_nms_script(self, script_path: Path):
         """Generate NMS deployment script"""
+        orc = self.config['orchestrator']
+        domain = self.config['domain']
+        admin_email = self.config['admin_email']
+        
         script_content = f"""#!/bin/bash
 set -e
 
 echo "💻 Deploying Network Management System..."
 
-# Add Magma Helm repository
-helm repo add magma https://magma.github.io/magma/helm-charts
-helm repo update
-
 # Deploy NMS
 helm upgrade --install nms magma/nms \\
-    --namespace {self.config['orchestrator']['namespace']} \\
-    --set global.domain={self.config['domain']} \\
-    --set nms.admin.email={self.config['admin_email']} \\
-    --set nms.host={self.config['domain']} \\
+    --namespace {orc['namespace']} \\
+    --set global.domain={domain} \\
+    --set nms.admin.email={admin_email} \\
+    --set nms.host={domain} \\
     --set nms.port=8080
 
 echo "✅ Network Management System deployment completed"
 """
         
-        with open(script_path, 'w') as f:
-            f.write(script_content)
+        script_path.write_text(script_content, encoding='utf-8')
     
     def display_deployment_summary(self):
         """Display deployment summary and access information"""
@@ -742,9 +1111,17 @@ def main():
     
     # Load configuration if provided
     if args.config:
+        import yaml
+        try:
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:
+            from yaml import SafeLoader
+        
         try:
             with open(args.config, 'r') as f:
-                deployment.config = yaml.safe_load(f)
+                deployment.config = yaml.load(f, Loader=SafeLoader) or {}
+            if not isinstance(deployment.config, dict):
+                raise ValueError("expected a YAML mapping")
             print(f"✅ Configuration loaded from {args.config}")
         except Exception as e:
             print(f"❌ Error loading configuration: {e}")
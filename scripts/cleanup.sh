@@ -118,6 +118,24 @@ cleanup_kubernetes() {
         return 0
     fi
     
+    # Remove orchestrator resources applied from rendered manifests by
+    # deploy_magma.py; these are not Helm releases and may be cluster-scoped
+    local manifests_dir
+    manifests_dir="$(dirname "${BASH_SOURCE[0]}")/orchestrator-manifests"
+    if [[ -d "$manifests_dir" ]]; then
+        print_info "Removing orchestrator resources applied by deploy_magma.py..."
+        local manifests_namespace=magma
+        if [[ -f "$manifests_dir/namespace" ]]; then
+            manifests_namespace=$(<"$manifests_dir/namespace")
+        fi
+        if kubectl delete --ignore-not-found --namespace "$manifests_namespace" -f "$manifests_dir"; then
+            rm -rf "$manifests_dir"
+            print_success "Orchestrator resources cleaned up"
+        else
+            print_warning "Failed to remove some orchestrator resources; manifests kept in $manifests_dir"
+        fi
+    fi
+    
     # Remove Magma namespace and all resources
     if kubectl get namespace magma >/dev/null 2>&1; then
         print_info "Removing Magma namespace and all resources..."